@@ -20,7 +20,7 @@ from bpy.types import Operator
 from bpy.props import IntProperty, BoolProperty
 from mathutils import Vector
 
-from sktransfer.shapekeys import transfer_shapekey_via_uv
+from sktransfer.shapekeys import transfer_shapekey_via_uv, estimate_buffer_resolution
 
 from typing import Tuple
 
@@ -32,12 +32,25 @@ class OBJECT_OT_transfer_shapekey_via_uv(Operator):
     bl_label = "Transfer ShapeKey via UV"
     bl_options = {'REGISTER', 'UNDO'}
 
-    buffer_size: IntProperty(
-        name="buffer_size",
-        default=256,
-        description="The resolution (size X size) of the intermediate memory buffer storing the ShapeKey deltas and their interpolation."
-                    "This will occupy 8*(size*size*4) memory for an numpy float64 ndarray."
-                    "Increase this size if you have a high density of pixels in the UV and see distortions in the transferred ShapeKey."
+    buffer_width: IntProperty(
+        name="buffer_width",
+        default=0,
+        min=0,
+        description="The horizontal (U) resolution of the intermediate memory buffer storing the ShapeKey deltas and their interpolation."
+                    " If 0, it is estimated from the density of the source UV map (at most 2048),"
+                    " so that a typical UV edge spans 4 pixels."
+                    " The buffer will occupy 4*(width*height*4) = 16*width*height bytes of memory for a numpy float32 ndarray,"
+                    " and about 100*width*height bytes are temporarily needed while interpolating."
+                    " Increase this size if you have a high density of pixels in the UV and see distortions in the transferred ShapeKey."
+                    " Conversely, if the buffer is small enough that every pixel receives a delta, the interpolation is skipped."
+    )
+
+    buffer_height: IntProperty(
+        name="buffer_height",
+        default=0,
+        min=0,
+        description="The vertical (V) resolution of the intermediate memory buffer storing the ShapeKey deltas and their interpolation."
+                    " If 0, it is estimated from the density of the source UV map (see buffer_width)."
     )
 
     relative_to_normals: BoolProperty(
@@ -129,11 +142,19 @@ class OBJECT_OT_transfer_shapekey_via_uv(Operator):
         dst_mesh = dst_obj.data
         dst_active_uv_idx = dst_mesh.uv_layers.active_index
 
+        # Estimate the buffer sizes which were not specified
+        buffer_width, buffer_height = self.buffer_width, self.buffer_height
+        if buffer_width == 0 or buffer_height == 0:
+            auto_width, auto_height = estimate_buffer_resolution(mesh=src_mesh, uv_layer_idx=src_active_uv_idx)
+            print(f"Estimated buffer resolution from the source UV density: {auto_width}x{auto_height}")
+            buffer_width = buffer_width or auto_width
+            buffer_height = buffer_height or auto_height
+
         print(f"Transferring from object {src_obj.name} ShapeKey with idx {src_active_sk_idx}"
               f" using uv layer {src_active_uv_idx} --> to object {dst_obj.name} using uv {dst_active_uv_idx}...")
         transfer_shapekey_via_uv(src_obj=src_obj, src_sk_idx=src_active_sk_idx, src_uv_idx=src_active_uv_idx,
                                  dst_obj=dst_obj, dst_uv_idx=dst_active_uv_idx,
-                                 resolution=(self.buffer_size, self.buffer_size),
+                                 resolution=(buffer_width, buffer_height),
                                  use_normals=self.relative_to_normals,
                                  save_debug_images=self.save_debug_images)
 
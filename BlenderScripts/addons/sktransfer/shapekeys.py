@@ -3,7 +3,6 @@
 # file, You can obtain one at http://mozilla.org/MPL/2.0/.
 
 import bpy
-from mathutils import Vector, Quaternion
 
 import numpy as np
 
@@ -15,40 +14,135 @@ from sktransfer.delaunay.delaunay import delaunay
 
 from typing import Tuple
 
+# SciPy is not bundled with Blender. If it was installed in the Blender Python interpreter,
+# its QHull-based interpolation replaces the (much slower) internal triangulation and triangle filling.
+try:
+    from scipy.interpolate import LinearNDInterpolator
+    from scipy.spatial import QhullError
+except ImportError:
+    LinearNDInterpolator = None
+
+# Without SciPy, matplotlib can still interpolate over the internal triangulation instead of the pure-Python triangle filling.
+try:
+    import matplotlib.tri as mtri
+except ImportError:
+    mtri = None
+
+# PIL is not bundled with Blender either, and it is needed only to save the debug images.
+try:
+    import PIL.Image
+except ImportError:
+    PIL = None
+
+# When estimating the buffer resolution from the UV density, the typical UV edge should cover this number of pixels.
+# This keeps close vertices in separate pixels, but leaves most of the pixels empty (to be interpolated):
+# estimated buffers are never dense enough to skip the triangulation (see DENSE_MAP_HOLE_RATIO).
+AUTO_BUFFER_PIXELS_PER_EDGE = 4
+# Limits and alignment of the estimated buffer resolution. Rows aligned to 16 float32 pixels start on a cache line.
+# The interpolation temporarily needs about 100 bytes per pixel (~400MB for 2048x2048).
+AUTO_BUFFER_MIN_SIZE = 16
+AUTO_BUFFER_MAX_SIZE = 2048
+AUTO_BUFFER_ALIGNMENT = 16
+
+# Below this ratio of empty pixels in the counts map, the delta map is used as-is, without triangulation and filling.
+DENSE_MAP_HOLE_RATIO = 1e-3
+
+
+def _bulk_get(collection, attribute: str, width: int = 1, dtype=np.float32) -> np.ndarray:
+    """
+    Reads an attribute of all the elements of a Blender collection with a single foreach_get call,
+    avoiding the creation of a Python object for each element.
+    :param collection: The Blender collection (e.g., mesh.loops, shape_key.data)
+    :param attribute: The name of the attribute to read (e.g., "vertex_index", "co")
+    :param width: The number of components of the attribute (e.g., 3 for coordinates)
+    :param dtype: The numpy type of the output array. Must match the internal Blender type (float or int)
+    :return: An array of shape (len(collection), width), or (len(collection),) if width is 1
+    """
+
+    out = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attribute, out)
+    if width > 1:
+        out = out.reshape(-1, width)
+
+    return out
+
 
-def _quaternion_between(v1: Vector, v2: Vector) -> Quaternion:
+def _rotate_to_canonical(vectors: np.ndarray, normals: np.ndarray, inverse: bool = False) -> np.ndarray:
     """
-    Computes the Quaternion aligning the direction of v1 to v2
-    :param v1:
-    :param v2:
-    :return: The Quaternion that can rotate v1 to v2
+    Rotates each vector by the Quaternion aligning the direction of its normal to the canonical normal,
+    which is the Y axis (0, 1, 0).
+    :param vectors: (N, 3) array of vectors to rotate
+    :param normals: (N, 3) array with the normal associated to each vector
+    :param inverse: If True, applies the inverse rotation (from the canonical normal back to the vertex normal)
+    :return: A new (N, 3) array with the rotated vectors
     """
 
+    canonical_normal = np.array((0.0, 1.0, 0.0), dtype=normals.dtype)
+
+    lengths = np.linalg.norm(normals, axis=1, keepdims=True)
+    normals_n = normals / np.maximum(lengths, np.finfo(normals.dtype).tiny)
+
     # From https://stackoverflow.com/questions/1171849/finding-quaternion-representing-the-rotation-from-one-vector-to-another
-    # One can rotate a vector u to vector v with
-    #
-    # function fromVectors(u, v) {
-    #
-    #   d = dot(u, v)
-    #   w = cross(u, v)
-    #
-    #   return Quaternion(d + sqrt(d * d + dot(w, w)), w).normalize()
-    # }
-    # If it is known that the vectors u to vector v are unit vectors, the function reduces to
-    #
-    # function fromUnitVectors(u, v) {
-    #   return Quaternion(1 + dot(u, v), cross(u, v)).normalize()
-    # }
+    # For unit vectors u and v, the Quaternion (w, xyz) = normalize(1 + dot(u, v), cross(u, v))
+    d = normals_n @ canonical_normal
+    xyz = np.cross(normals_n, canonical_normal)
+    q_len = np.sqrt((1 + d) ** 2 + np.einsum('ij,ij->i', xyz, xyz))
+
+    # Normals opposite to the canonical one (pointing along -Y) give a zero quaternion.
+    # As Blender's Quaternion.normalized() does, fall back to (0, 1, 0, 0): a 180 degrees rotation around X.
+    opposite = q_len < 1e-6
+    q_len[opposite] = 1.0
+    w = ((1 + d) / q_len)[:, None]
+    xyz = xyz / q_len[:, None]
+    w[opposite] = 0.0
+    xyz[opposite] = (1.0, 0.0, 0.0)
+    assert np.allclose(w[:, 0] ** 2 + np.einsum('ij,ij->i', xyz, xyz), 1.0, atol=1e-4)
+
+    if inverse:
+        xyz = -xyz
+
+    # Rotation of v by the unit quaternion (w, xyz): v + 2w(xyz x v) + 2 xyz x (xyz x v)
+    t = 2 * np.cross(xyz, vectors)
+    return vectors + w * t + np.cross(xyz, t)
+
+
+def estimate_buffer_resolution(mesh: bpy.types.Mesh, uv_layer_idx: int) -> Tuple[int, int]:
+    """
+    Estimates a resolution of the delta buffer suitable for the density of the given UV layer.
+    Width and height are estimated separately, so that the typical UV edge (median of the non-zero edge lengths
+    along U and V) covers AUTO_BUFFER_PIXELS_PER_EDGE pixels along each axis.
+    Each size is clamped in [AUTO_BUFFER_MIN_SIZE, AUTO_BUFFER_MAX_SIZE] and rounded up to a multiple of AUTO_BUFFER_ALIGNMENT.
+
+    :param mesh: The mesh whose UVs are used to store the deltas
+    :param uv_layer_idx: The index of the UV layer
+    :return: The (width, height) of the buffer
+    """
 
-    v1n = v1.normalized()
-    v2n = v2.normalized()
+    uv = _bulk_get(mesh.uv_layers[uv_layer_idx].uv, "vector", width=2)
 
-    d = v1n.dot(v2n)
-    w = v1n.cross(v2n)
+    # For each loop, find the next loop around the same polygon. Together they form a polygon edge in UV space.
+    loop_start = _bulk_get(mesh.polygons, "loop_start", dtype=np.int32)
+    loop_total = _bulk_get(mesh.polygons, "loop_total", dtype=np.int32)
+    next_loop = np.arange(1, len(uv) + 1)
+    next_loop[loop_start + loop_total - 1] = loop_start
 
-    out = Quaternion((1 + d, *w)).normalized()
+    # UVs are float32: compute in float64 and tolerate the rounding noise,
+    # so that, e.g., a 1/12 median edge at 4 pixels per edge gives 48 pixels and not 49
+    edges_extent = np.abs(uv[next_loop].astype(np.float64) - uv)
 
-    return out
+    out = []
+    for axis in range(2):
+        extents = edges_extent[:, axis]
+        extents = extents[extents > 0]
+        if len(extents) == 0:
+            size = AUTO_BUFFER_MIN_SIZE
+        else:
+            size = int(np.ceil(AUTO_BUFFER_PIXELS_PER_EDGE / np.median(extents) - 1e-3))
+            size = min(max(size, AUTO_BUFFER_MIN_SIZE), AUTO_BUFFER_MAX_SIZE)
+        size = ((size + AUTO_BUFFER_ALIGNMENT - 1) // AUTO_BUFFER_ALIGNMENT) * AUTO_BUFFER_ALIGNMENT
+        out.append(size)
+
+    return out[0], out[1]
 
 
 def export_shapekey_info(mesh: bpy.types.Mesh, shape_key_idx: int, uv_layer_idx: int,
@@ -56,12 +150,13 @@ def export_shapekey_info(mesh: bpy.types.Mesh, shape_key_idx: int, uv_layer_idx:
     """
     Given a mesh, a ShapeKey index and a UV layer, uses the UV vertex coordinates to produce a 3D map storing the offset of each vertex with respect to the base ShapeKey.
     The function returns a "ShapeKey Info" 4D array storing the ShapeKey offset and a counter info.
-    sk_info.shape == (resolution[0], resolution[1], 4)
+    sk_info.shape == (resolution[1], resolution[0], 4), i.e., (height, width, 4)
     For each element of the output x/y coordinate has 4 elements. The first three are the offset of the vertex
     xyz_map = sk_info[:, :, :3]
     The last element is a counter of how many times the same cell has been written.
     counts_map = sk_info[:, :, 3]
-    The routine works by iterating the polygons and, for each polygon, retrieves the shape_key offset and stores it according to the UV coordinate.
+    The routine works by bulk-reading the loops, UVs, and ShapeKey coordinates of the mesh and, for each loop,
+    stores the shape_key offset of its vertex according to the UV coordinate.
     In so doing, the same map "pixel" can be written multiple times. The counts_map stores how many times the same location was written.
     The stored xyz result is the mean of all written values.
     """
@@ -72,61 +167,46 @@ def export_shapekey_info(mesh: bpy.types.Mesh, shape_key_idx: int, uv_layer_idx:
     out_w, out_h = resolution[0], resolution[1]
 
     # Preparing the output matrix
-    out = np.zeros(shape=(out_h, out_w, 4))
+    # ShapeKey coordinates are 32-bit floats in Blender. No need to double the size with float64.
+    out = np.zeros(shape=(out_h, out_w, 4), dtype=np.float32)
 
     reference_shape_key: bpy.types.ShapeKey = mesh.shape_keys.reference_key
 
     #
-    # Iterate over the polygons of the uv layer
-    for poly in mesh.polygons:
-        assert type(poly) == bpy.types.MeshPolygon
-        
-        assert len(poly.vertices) == len(poly.loop_indices)
-
-        # For each vertex of the polygon
-        for v_idx, loop_idx in zip(poly.vertices, poly.loop_indices):
-            # print(v_idx)
-            assert type(v_idx) == int
-            assert type(loop_idx) == int
-            
-            # Get the UV coords
-            # U increases on width (left to right), and V increases on height (bottom to top!)
-            uv_coords = uv_layer.uv[loop_idx].vector
-            # print(uv_coords)
-
-            assert 0.0 <= uv_coords.x <= 1.0
-            assert 0.0 <= uv_coords.y <= 1.0
-            
-            # Approximate to int pixel coord
-            out_x = round(uv_coords.x * (out_w - 1))
-            out_y = round(uv_coords.y * (out_h - 1))
-            # print(uv_pixel_coords)
-            assert 0 <= out_x <= out_w - 1
-            assert 0 <= out_y <= out_h - 1
-
-            # Get the blendshape offset value
-            sk_vertex_coords = shape_key.data[v_idx].co
-            # sk_base_vertex_coords = shape_key.relative_key.data[v_idx].co
-            sk_base_vertex_coords = reference_shape_key.data[v_idx].co
-            delta = sk_vertex_coords - sk_base_vertex_coords
-            # print(sk_vertex_coords, sk_base_vertex_coords, delta)
-
-            # Convert the delta into a vector relative to the vertex normal
-            if use_normals:
-                v_normal = mesh.vertices[v_idx].normal
-                canonical_normal = Vector((0, 1, 0))
-                rot_to_canonical = _quaternion_between(v_normal, canonical_normal)
-                delta = rot_to_canonical @ delta
-
-            # Accumulate the delta into the output picture
-            if out[out_y, out_x, 3] == 0.0:
-                out[out_y, out_x, :] = delta.x, delta.y, delta.z, 1
-            else:
-                current_mean = Vector(out[out_y, out_x, :3])
-                count = out[out_y, out_x, 3]
-                new_mean = ((current_mean * count) + delta) / (count + 1)
-
-                out[out_y, out_x, :] = new_mean.x, new_mean.y, new_mean.z, count + 1
+    # Bulk-read the vertex index and the UV coords of each loop
+    loop_v_idx = _bulk_get(mesh.loops, "vertex_index", dtype=np.int32)
+
+    # U increases on width (left to right), and V increases on height (bottom to top!)
+    uv = _bulk_get(uv_layer.uv, "vector", width=2)
+
+    assert ((0.0 <= uv) & (uv <= 1.0)).all()
+
+    # Approximate to int pixel coord
+    out_x = np.rint(uv[:, 0] * (out_w - 1)).astype(np.intp)
+    out_y = np.rint(uv[:, 1] * (out_h - 1)).astype(np.intp)
+
+    #
+    # Get the blendshape offset values
+    sk_co = _bulk_get(shape_key.data, "co", width=3)
+    ref_co = _bulk_get(reference_shape_key.data, "co", width=3)
+
+    deltas = sk_co[loop_v_idx] - ref_co[loop_v_idx]
+
+    # Convert the deltas into vectors relative to the vertex normals
+    if use_normals:
+        normals = _bulk_get(mesh.vertices, "normal", width=3)
+        deltas = _rotate_to_canonical(vectors=deltas, normals=normals[loop_v_idx])
+
+    #
+    # Accumulate the sum of the deltas and their count into the output picture
+    flat_idx = out_y * out_w + out_x
+    flat_out = out.reshape(-1, 4)
+    np.add.at(flat_out[:, :3], flat_idx, deltas)
+    flat_out[:, 3] = np.bincount(flat_idx, minlength=out_h * out_w)
+
+    # Turn the sums into means, where at least one delta was written
+    written = out[:, :, 3] > 0
+    out[written, :3] /= out[written, 3:]
 
     return out
 
@@ -165,33 +245,37 @@ def create_shapekey(obj: bpy.types.Object, uv_layer_idx: int, xyz_map: np.ndarra
     uv_layer: bpy.types.MeshUVLoopLayer = mesh.uv_layers[uv_layer_idx]
     reference_shape_key: bpy.types.ShapeKey = mesh.shape_keys.reference_key
 
-    # For each polygon
-    for poly in mesh.polygons:
-        # For each vertex and loop index
-        for v_idx, loop_idx in zip(poly.vertices, poly.loop_indices):
-            # get the UV coordinates
-            uv_coords = uv_layer.uv[loop_idx].vector
-            # convert the coordinates in pixel space
-            uv_x = round(uv_coords.x * (map_w - 1))
-            uv_y = round(uv_coords.y * (map_h - 1))
-            
-            # Take the delta from the map
-            delta = Vector(xyz_map[uv_y, uv_x])
-            # print(f"For poly {poly.index} coords {uv_x},{uv_y} --> delta {delta}")
-
-            # Convert the delta into a vector relative to the vertex normal
-            if use_normals:
-                v_normal = mesh.vertices[v_idx].normal
-                canonical_normal = Vector((0, 1, 0))
-                rot_to_canonical = _quaternion_between(v_normal, canonical_normal)
-                delta = rot_to_canonical.inverted() @ delta
-
-            # Adds the delta to the vertex position in the reference ShapeKey
-            reference_coords: Vector = reference_shape_key.data[v_idx].co
-            absolute_coords = reference_coords + delta
-
-            # Store the new coordinate in the ShapeKey
-            new_sk.data[v_idx].co = absolute_coords
+    n_vertices = len(mesh.vertices)
+
+    #
+    # Bulk-read the vertex index and the UV coords of each loop
+    loop_v_idx = _bulk_get(mesh.loops, "vertex_index", dtype=np.int32)
+    uv = _bulk_get(uv_layer.uv, "vector", width=2)
+
+    # convert the coordinates in pixel space
+    uv_x = np.rint(uv[:, 0] * (map_w - 1)).astype(np.intp)
+    uv_y = np.rint(uv[:, 1] * (map_h - 1)).astype(np.intp)
+
+    # Take the deltas from the map
+    deltas = xyz_map[uv_y, uv_x]
+
+    # Convert the deltas into vectors relative to the vertex normals
+    if use_normals:
+        normals = _bulk_get(mesh.vertices, "normal", width=3)
+        deltas = _rotate_to_canonical(vectors=deltas, normals=normals[loop_v_idx], inverse=True)
+
+    # A vertex shared by several loops (e.g., along UV seams) gets the mean of their deltas
+    vertex_deltas = np.zeros(shape=(n_vertices, 3), dtype=np.float32)
+    np.add.at(vertex_deltas, loop_v_idx, deltas)
+    vertex_counts = np.bincount(loop_v_idx, minlength=n_vertices)
+    vertex_deltas /= np.maximum(vertex_counts, 1)[:, None]
+
+    # Adds the deltas to the vertex positions in the reference ShapeKey
+    reference_coords = _bulk_get(reference_shape_key.data, "co", width=3)
+    absolute_coords = reference_coords + vertex_deltas
+
+    # Store the new coordinates in the ShapeKey
+    new_sk.data.foreach_set("co", absolute_coords.astype(np.float32, copy=False).ravel())
 
 
 def _save_buffer_as_image(buffer: np.ndarray, save_name: str) -> None:
@@ -205,7 +289,8 @@ def _save_buffer_as_image(buffer: np.ndarray, save_name: str) -> None:
     :return: None
     """
 
-    import PIL.Image
+    if PIL is None:
+        raise Exception("Saving debug images requires the PIL module (pip install pillow)")
 
     # For 3D arrays, we try to create an RGB image.
     # For 2D arrays we go for a greyscale image.
@@ -220,8 +305,12 @@ def _save_buffer_as_image(buffer: np.ndarray, save_name: str) -> None:
     if color_scheme is None:
         raise Exception(f"Unsupported color buffer shape {buffer.shape}")
 
-    # Normalize the buffer range in [0.0-255.0]
-    buffer_255 = 255.0 * (buffer - buffer.min()) / (buffer.max() - buffer.min())
+    # Normalize the buffer range in [0.0-255.0], working in-place on a single float32 temporary
+    lo, hi = buffer.min(), buffer.max()
+    scale = 255.0 / (hi - lo) if hi > lo else 0.0
+    buffer_255 = np.subtract(buffer, lo, dtype=np.float32)
+    buffer_255 *= scale
+    np.clip(buffer_255, 0.0, 255.0, out=buffer_255)
     # And convert it into unsigned bytes for PIL
     buffer_255 = buffer_255.astype(np.uint8)
     # Creates the PIL.Image.Image
@@ -230,6 +319,136 @@ def _save_buffer_as_image(buffer: np.ndarray, save_name: str) -> None:
     counts_img.save(save_name)
 
 
+def _triangulate(points: np.ndarray) -> np.ndarray:
+    """
+    Computes the Delaunay triangulation of the given pixels, using the internal quad-edge implementation.
+
+    :param points: (n_points, 2) integer array with the x,y pixel coordinates of the points to triangulate
+    :return: A (n_triangles, 3) integer array with the indices of the points of each triangle.
+    """
+
+    n_vertices = len(points)
+    vertices = [Vertex(int(x), int(y)) for x, y in points]
+
+    print("Triangulating...")
+    m = Mesh()  # this object holds the edges and vertices
+    m.loadVertices(vertices)
+    res = delaunay(m, 0, n_vertices - 1)
+    print(f"Delaunay result:", f"{res}")
+
+    polygons = m.listPolygons()
+    print(f"Num Polygons {len(polygons)}")
+    # Filter out polygons with more or less than 3 vertices
+    polygons = [p for p in polygons if len(p.vertices) == 3]
+    print(f"Polygons with 3 vertices: {len(polygons)}")
+
+    # Flatten the vertex coordinates of all triangles at once
+    n_triangles = len(polygons)
+    triangles = np.fromiter((c for p in polygons for v in p.vertices for c in (v.x, v.y)),
+                            dtype=np.int32, count=n_triangles * 6).reshape(-1, 3, 2)
+
+    # And convert them into indices of the points array
+    xs, ys = points[:, 0], points[:, 1]
+    points_indices = np.full((ys.max() + 1, xs.max() + 1), -1, dtype=np.int32)
+    points_indices[ys, xs] = np.arange(n_vertices)
+    simplices = points_indices[triangles[:, :, 1], triangles[:, :, 0]]
+
+    # The quad-edge faces are not perfectly clean: the same triangle can be listed twice (e.g., with 3 points only),
+    # collinear points can form zero-area triangles, and, if the convex hull is a triangle,
+    # the outer face is listed as well, overlapping all the others. Drop them.
+    simplices = np.unique(np.sort(simplices, axis=1), axis=0)
+    tri_xy = points[simplices].astype(np.int64)
+    double_areas = np.abs((tri_xy[:, 1, 0] - tri_xy[:, 0, 0]) * (tri_xy[:, 2, 1] - tri_xy[:, 0, 1])
+                          - (tri_xy[:, 2, 0] - tri_xy[:, 0, 0]) * (tri_xy[:, 1, 1] - tri_xy[:, 0, 1]))
+    simplices, double_areas = simplices[double_areas > 0], double_areas[double_areas > 0]
+    if n_vertices > 3 and len(simplices) > 1:
+        # The outer face can only be the largest triangle, and it contains all the points (inside or on its edges).
+        # A real triangle never does, as there is at least one more point outside of it.
+        largest = np.argmax(double_areas)
+        (x0, y0), (x1, y1), (x2, y2) = points[simplices[largest]].astype(np.int64)
+        px, py = points[:, 0].astype(np.int64), points[:, 1].astype(np.int64)
+        e0 = (x1 - x0) * (py - y0) - (y1 - y0) * (px - x0)
+        e1 = (x2 - x1) * (py - y1) - (y2 - y1) * (px - x1)
+        e2 = (x0 - x2) * (py - y2) - (y0 - y2) * (px - x2)
+        contains_all = ((e0 >= 0) & (e1 >= 0) & (e2 >= 0)).all() or ((e0 <= 0) & (e1 <= 0) & (e2 <= 0)).all()
+        if contains_all:
+            simplices = np.delete(simplices, largest, axis=0)
+    print(f"Valid triangles: {len(simplices)}")
+
+    return simplices
+
+
+def _fill_triangles(points: np.ndarray, simplices: np.ndarray, values_map: np.ndarray) -> np.ndarray:
+    """
+    Fills the triangles by linearly interpolating the values at their vertices.
+    Uses matplotlib.tri.LinearTriInterpolator if available, otherwise falls back to the internal triangle filling.
+
+    :param points: (n_points, 2) integer array with the x,y pixel coordinates of the triangulated points
+    :param simplices: (n_triangles, 3) integer array with the indices of the points of each triangle
+    :param values_map: The (H, W, 3) map containing the values at the points
+    :return: A new (H, W, 3) float32 array, where the pixels inside the triangles are interpolated and the others are 0.
+    """
+
+    if mtri is None or len(simplices) == 0:
+        return fillTriangles(triangles=points[simplices], values_map=values_map)
+
+    map_height, map_width, map_depth = values_map.shape
+
+    triangulation = mtri.Triangulation(points[:, 0], points[:, 1], triangles=simplices)
+    xs, ys = points[:, 0], points[:, 1]
+    grid_x, grid_y = np.meshgrid(np.arange(map_width), np.arange(map_height))
+
+    out = np.zeros(values_map.shape, dtype=np.float32, order='C')
+    for c in range(map_depth):
+        interp = mtri.LinearTriInterpolator(triangulation, values_map[ys, xs, c])
+        out[:, :, c] = interp(grid_x, grid_y).filled(0.0)
+
+    return out
+
+
+def _interpolate_deltas(counts_map: np.ndarray, xyz_map: np.ndarray) -> np.ndarray:
+    """
+    Fills the gaps of the delta map by Delaunay-triangulating the pixels which received at least one delta
+    and linearly interpolating the deltas inside each triangle.
+    Uses scipy.interpolate.LinearNDInterpolator if available,
+    otherwise falls back to the internal triangulation and to _fill_triangles.
+
+    :param counts_map: The (H, W) map counting how many deltas were written in each pixel
+    :param xyz_map: The (H, W, 3) map of the deltas
+    :return: A new (H, W, 3) float32 array, where the pixels inside the triangles are interpolated
+     and the others are 0.
+    """
+
+    ys, xs = np.nonzero(counts_map)
+    points = np.column_stack([xs, ys])
+    print(f"Found {len(points)} vertices.")
+
+    # With less than 3 points there is no triangle to fill: keep the deltas as they are.
+    if len(points) < 3:
+        print("Not enough vertices to triangulate.")
+        return np.ascontiguousarray(xyz_map, dtype=np.float32)
+
+    if LinearNDInterpolator is not None:
+        map_height, map_width = counts_map.shape
+
+        print("Triangulating and interpolating (scipy)...")
+        try:
+            interpolator = LinearNDInterpolator(points, xyz_map[ys, xs], fill_value=0.0)
+        except QhullError as e:
+            # E.g., all the points are on a line. The internal triangulation copes with it.
+            print(f"QHull failed ({str(e).splitlines()[0]}). Falling back to the internal triangulation.")
+        else:
+            grid_x, grid_y = np.meshgrid(np.arange(map_width), np.arange(map_height))
+            return np.ascontiguousarray(interpolator(grid_x, grid_y), dtype=np.float32)
+
+    simplices = _triangulate(points=points)
+    out = _fill_triangles(points=points, simplices=simplices, values_map=xyz_map)
+    # Degenerate (e.g., collinear) triangles are not filled: make sure that the original deltas are kept anyway
+    out[ys, xs] = xyz_map[ys, xs]
+
+    return out
+
+
 def transfer_shapekey_via_uv(src_obj: bpy.types.Object, src_sk_idx: int, src_uv_idx: int,
                              dst_obj: bpy.types.Object, dst_uv_idx: int,
                              resolution: Tuple[int, int],
@@ -245,7 +464,7 @@ def transfer_shapekey_via_uv(src_obj: bpy.types.Object, src_sk_idx: int, src_uv_
     :param src_uv_idx: The index of the UV layer to be used for creating the delta map
     :param dst_obj: The destination object on which a new ShapeKey will be created
     :param dst_uv_idx: The UV layer of the destination object that should be used to find locations on the delta map
-    :param resolution: The resolution of the intermediate delta map
+    :param resolution: The (width, height) resolution of the intermediate delta map
     :param use_normals: If True, the vertex deltas will be saved and loaded as relative to the vertex normal
     :param save_debug_images: If True, the intermediate buffers (counts, deltas, and triangulates deltas)
      will be saved as PNG images for visual debugging.
@@ -285,31 +504,15 @@ def transfer_shapekey_via_uv(src_obj: bpy.types.Object, src_sk_idx: int, src_uv_
 
     #
     # Triangulate and Fill the ShapeKey deltas
-    vertices = []
-    for y in range(map_height):
-        for x in range(map_width):
-            c = counts_map[y, x]
-            if c != 0.0:
-                vertices.append(Vertex(x, y))
-
-    n_vertices = len(vertices)
-    print(f"Found {n_vertices} vertices.")
-
-    print("Triangulating...")
-    m = Mesh()  # this object holds the edges and vertices
-    m.loadVertices(vertices)
-    res = delaunay(m, 0, n_vertices - 1)
-    print(f"Delaunay result:", f"{res}")
-
-    polygons = m.listPolygons()
-    print(f"Num Polygons {len(polygons)}")
-    # Filter out polygons with more or less than 3 vertices
-    polygons = [p for p in polygons if len(p.vertices) == 3]
-    print(f"Polygons with 3 vertices: {len(polygons)}")
-
-    # Fill all the triangles
-    filled_xyz_map = fillTriangles(polygons=polygons, values_map=xyz_map)
-    print(f"Filled xyz_map shape {filled_xyz_map.shape}")
+    # If (almost) every pixel already received a delta, there are no gaps worth filling.
+    hole_ratio = np.count_nonzero(counts_map == 0) / counts_map.size
+    if hole_ratio < DENSE_MAP_HOLE_RATIO:
+        print(f"Holes ratio {hole_ratio:.5f} < {DENSE_MAP_HOLE_RATIO}: skipping triangulation and filling.")
+        filled_xyz_map = xyz_map
+    else:
+        print(f"Holes ratio {hole_ratio:.5f}: triangulating and filling.")
+        filled_xyz_map = _interpolate_deltas(counts_map=counts_map, xyz_map=xyz_map)
+        print(f"Filled xyz_map shape {filled_xyz_map.shape}")
 
     if save_debug_images:
         # Save the resulting map
@@ -4,154 +4,129 @@
 
 import numpy as np
 
+# Numba is not bundled with Blender. If it was installed in the Blender Python interpreter,
+# triangles are rasterized by a native compiled loop. Otherwise, each triangle is filled with NumPy operations.
+try:
+    from numba import njit, prange
+    _NUMBA_AVAILABLE = True
+except ImportError:
+    _NUMBA_AVAILABLE = False
 
-# Support class associating a 2d vertex to the value that will be interpolated
-class ValuedVertex:
-    def __init__(self, x: int, y: int, val):
-        self.x: int = x
-        self.y: int = y
-        self.val: int = val
 
+def _drawTriangle(dest_raster: np.ndarray, xy: list, vals: np.ndarray) -> None:
+    """
+    Fills a triangle by computing the barycentric coordinates of all the pixels in its bounding box.
+    :param dest_raster: The (H, W, D) raster to draw into
+    :param xy: The x,y integer coordinates of the 3 vertices, as nested Python lists
+    :param vals: (3, D) array with the values at the vertices
+    """
 
-def _drawHorizontalLine(dest_raster: np.ndarray, x1: int, x2: int, y: int, val1, val2) -> None:
-    # 1-pixel only
-    if x1 == x2:
-        # assert (val1==val2).all()
-        dest_raster[y, x1] = val1  # (val1 + val2) / 2
-        return
-
-    # We draw only from left to right
-    if x1 > x2:
-        x1, x2 = x2, x1
-        val1, val2 = val2, val1
-
-    # Fill the raster by interpolating val1 to val2 from left to right (x1 to x2 inclusive)
-    dx = x2 - x1
-    dval = val2 - val1
-    for x in range(x1, x2 + 1):
-        k = (x - x1) / dx
-        assert 0.0 <= k <= 1.0
-        v = val1 + dval * k
-        dest_raster[y, x] = v
-
-
-def _fillBottomFlatTriangle(dest_raster: np.ndarray, v1: ValuedVertex, v2: ValuedVertex, v3: ValuedVertex) -> None:
-    # The flat bottom is between v2 and v3
-    assert v2.y == v3.y
-    # v1 is at the top
-    assert v1.y <= v2.y
-    assert v1.y <= v3.y
-
-    invslope1: float = (v2.x - v1.x) / (v2.y - v1.y)
-    invslope2: float = (v3.x - v1.x) / (v3.y - v1.y)
-
-    curx1: float = v1.x  # between v1 and v2
-    curx2: float = v1.x  # between v1 and v3
-
-    dy = v2.y - v1.y
-    assert dy > 0
-
-    for scanlineY in range(v1.y, v2.y + 1):
-        assert type(scanlineY) == int
-
-        # Compute pixel values
-        ky = (scanlineY - v1.y) / dy
-        assert 0.0 <= ky <= 1.0
-        val1 = v1.val + (v2.val - v1.val) * ky  # between v1 and v2
-        val2 = v1.val + (v3.val - v1.val) * ky  # between v1 and v3
-
-        _drawHorizontalLine(dest_raster=dest_raster, x1=int(curx1), x2=int(curx2), y=scanlineY, val1=val1, val2=val2)
-        curx1 += invslope1
-        curx2 += invslope2
-
-
-def _fillTopFlatTriangle(dest_raster: np.ndarray, v1: ValuedVertex, v2: ValuedVertex, v3: ValuedVertex) -> None:
-    # The flat top is between v1 and v2
-    assert v1.y == v2.y
-    # v3 is at the bottom
-    assert v1.y <= v3.y
-    assert v2.y <= v3.y
-
-    invslope1: float = (v3.x - v1.x) / (v3.y - v1.y)
-    invslope2: float = (v3.x - v2.x) / (v3.y - v2.y)
-
-    curx1: float = v3.x  # between v1 and v3 (backwards)
-    curx2: float = v3.x  # between v2 and v3 (backwards)
-
-    dy = v3.y - v1.y
-    assert dy > 0
-
-    for scanlineY in range(v3.y, v1.y - 1, -1):
-        assert type(scanlineY) == int
-
-        # Compute pixel values
-        ky = (scanlineY - v1.y) / dy
-        assert 0.0 <= ky <= 1.0
-        val1 = v1.val + (v3.val - v1.val) * ky  # between v1 and v3
-        val2 = v2.val + (v3.val - v2.val) * ky  # between v2 and v3
-
-        _drawHorizontalLine(dest_raster=dest_raster, x1=int(curx1), x2=int(curx2), y=scanlineY, val1=val1, val2=val2)
-        curx1 -= invslope1
-        curx2 -= invslope2
-
-
-def _drawTriangle(dest_raster: np.ndarray, v1: ValuedVertex, v2: ValuedVertex, v3: ValuedVertex) -> None:
-    # Sort vertices by increasing y coordinate
-    sorted_vertices = sorted((v1, v2, v3), key=lambda v: v.y)
-    v1, v2, v3 = sorted_vertices
-    # print(f"Sorted: {v1}   {v2}   {v3}")
-
-    assert v1.y <= v2.y <= v3.y
-
-    # case of bottom-flat triangle
-    if v2.y == v3.y:
-        _fillBottomFlatTriangle(dest_raster, v1, v2, v3)
-
-    # case of top-flat triangle
-    elif v1.y == v2.y:
-        _fillTopFlatTriangle(dest_raster, v1, v2, v3)
+    (x0, y0), (x1, y1), (x2, y2) = xy
 
-    # general case: split the triangle in a top-flat and bottom-flat
-    else:
-        assert v1.y < v2.y < v3.y
-        dx3 = v3.x - v1.x
-        dy2 = v2.y - v1.y
-        dy3 = v3.y - v1.y
-        # print("{dx3} {dy2} {dy3}")
-        dval3 = v3.val - v1.val
-        k4 = (v2.y - v1.y) / (dy3 + 1)
-        assert 0.0 <= k4 <= 1.0
-        v4_val = v1.val + dval3 * k4
-        v4 = ValuedVertex(
-            x=int(v1.x + (dy2 / dy3) * dx3),
-            y=v2.y,
-            val=v4_val
-        )
-        _fillBottomFlatTriangle(dest_raster, v1, v2, v4)
-        _fillTopFlatTriangle(dest_raster, v2, v4, v3)
-
-
-def fillTriangles(polygons: list, values_map: np.ndarray) -> np.ndarray:
+    # Twice the signed area. Degenerate (collinear) triangles have nothing to fill.
+    denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+    if denom == 0:
+        return
+    # Orient the edge functions so that they are positive inside the triangle
+    sign = 1 if denom > 0 else -1
+
+    xs = np.arange(min(x0, x1, x2), max(x0, x1, x2) + 1)
+    ys = np.arange(min(y0, y1, y2), max(y0, y1, y2) + 1)
+
+    # The (integer) edge functions are affine in x and y:
+    # compute the column and row terms once and broadcast their sum over the bounding box.
+    # Each weight is computed from its own edge function, so that its sign is exact on the triangle borders
+    e0 = (sign * (y1 - y2) * (xs - x2))[None, :] + (sign * (x2 - x1) * (ys - y2))[:, None]
+    e1 = (sign * (y2 - y0) * (xs - x2))[None, :] + (sign * (x0 - x2) * (ys - y2))[:, None]
+    e2 = (sign * (y0 - y1) * (xs - x1))[None, :] + (sign * (x1 - x0) * (ys - y1))[:, None]
+    mask = (e0 >= 0) & (e1 >= 0) & (e2 >= 0)
+
+    # Divide only the weights of the pixels inside the triangle
+    rows, cols = np.nonzero(mask)
+    weights = np.column_stack([e0[mask], e1[mask], e2[mask]]) / (sign * denom)
+    dest_raster[ys[rows], xs[cols]] = weights @ vals
+
+
+if _NUMBA_AVAILABLE:
+    @njit(cache=True, parallel=True)
+    def _drawTriangles(dest_raster: np.ndarray, tri_xy: np.ndarray, tri_val: np.ndarray) -> None:
+        """
+        Compiled counterpart of calling _drawTriangle on each triangle.
+        Triangles are drawn in parallel: pixels on edges shared by two triangles get the value of either one.
+        """
+
+        depth = dest_raster.shape[2]
+
+        for i in prange(tri_xy.shape[0]):
+            x0, y0 = tri_xy[i, 0, 0], tri_xy[i, 0, 1]
+            x1, y1 = tri_xy[i, 1, 0], tri_xy[i, 1, 1]
+            x2, y2 = tri_xy[i, 2, 0], tri_xy[i, 2, 1]
+
+            denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+            if denom == 0:
+                continue
+            sign = 1 if denom > 0 else -1
+            inv_denom = 1.0 / (sign * denom)
+
+            # Increments of the (integer) edge functions when moving one pixel right (a) or down (b)
+            a0, b0 = sign * (y1 - y2), sign * (x2 - x1)
+            a1, b1 = sign * (y2 - y0), sign * (x0 - x2)
+            a2, b2 = sign * (y0 - y1), sign * (x1 - x0)
+
+            x_min, x_max = min(x0, x1, x2), max(x0, x1, x2)
+            y_min, y_max = min(y0, y1, y2), max(y0, y1, y2)
+
+            # Edge functions at the beginning of the row
+            row_e0 = a0 * (x_min - x2) + b0 * (y_min - y2)
+            row_e1 = a1 * (x_min - x2) + b1 * (y_min - y2)
+            row_e2 = a2 * (x_min - x1) + b2 * (y_min - y1)
+
+            for y in range(y_min, y_max + 1):
+                e0, e1, e2 = row_e0, row_e1, row_e2
+
+                for x in range(x_min, x_max + 1):
+                    if e0 >= 0 and e1 >= 0 and e2 >= 0:
+                        w0, w1, w2 = e0 * inv_denom, e1 * inv_denom, e2 * inv_denom
+                        for c in range(depth):
+                            dest_raster[y, x, c] = w0 * tri_val[i, 0, c] + w1 * tri_val[i, 1, c] + w2 * tri_val[i, 2, c]
+
+                    e0 += a0
+                    e1 += a1
+                    e2 += a2
+
+                row_e0 += b0
+                row_e1 += b1
+                row_e2 += b2
+
+
+def fillTriangles(triangles: np.ndarray, values_map: np.ndarray) -> np.ndarray:
     """
-    Given a list of triangles (polygons with 3 vertices and with integer coordinates)
+    Given an array of triangles (with integer vertex coordinates)
     and a map (np.ndarray) containing the values to be associated to the vertices
     creates a new raster np.ndarray of the same dimension, where each triangle is filled by interpolating the values.
 
-    :param polygons: The polygons, where each polygon is assumed to have 3 vertices and integer coordinates.
+    :param triangles: A (n_triangles, 3, 2) integer array with the x,y coordinates of the vertices of each triangle.
     :param values_map: The maps containing the source values of the vertices that we want to interpolate
-    :return: A new array, with the same dimension of the values, where the pixels inside the triangles are interpolated
-     according to the values at the vertices.
+    :return: A new float32 array, with the same dimension of the values, where the pixels inside the triangles are
+     interpolated according to the values at the vertices.
     """
 
-    out = np.zeros_like(values_map)
+    assert triangles.shape[1:] == (3, 2)
+
+    # values_map is usually a strided view (e.g., sk_info[:, :, :3]). Make sure the raster we write into is contiguous,
+    # so that pixels along a row are adjacent in memory.
+    out = np.zeros(values_map.shape, dtype=np.float32, order='C')
+    assert out.strides[1] == out.itemsize * out.shape[2]
 
-    for poly in polygons:
-        assert len(poly.vertices) == 3
+    # Gather, once, the coordinates and the values of the vertices of all triangles into contiguous arrays
+    tri_xy = np.ascontiguousarray(triangles, dtype=np.int32)
+    tri_val = np.ascontiguousarray(values_map[tri_xy[:, :, 1], tri_xy[:, :, 0]], dtype=out.dtype)
 
-        # print(f"Fill triangle {poly}")
-        # for v in poly.vertices:
-        #    print(f"{v} {v.x} {type(v.x)}")
-        val_vertices = [ValuedVertex(x=v.x, y=v.y, val=values_map[v.y, v.x]) for v in poly.vertices]
-        _drawTriangle(dest_raster=out, v1=val_vertices[0], v2=val_vertices[1], v3=val_vertices[2])
+    if _NUMBA_AVAILABLE:
+        _drawTriangles(out, tri_xy, tri_val)
+    else:
+        # Convert all the coordinates to Python ints at once, rather than unpacking numpy scalars per triangle
+        for xy, vals in zip(tri_xy.tolist(), tri_val):
+            _drawTriangle(dest_raster=out, xy=xy, vals=vals)
 
     return out